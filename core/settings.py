@@ -59,8 +59,16 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Cache compiled templates in process memory instead of
+            # re-reading and re-parsing them from disk on every request.
+            # APP_DIRS must stay off when loaders are set explicitly.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -148,6 +156,10 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+# Spool every upload to a temp file instead of buffering up to 2.5MB per
+# file in memory — add_course can receive several lecture videos at once
+FILE_UPLOAD_MAX_MEMORY_SIZE = 0
+
 # ---------------------------------------------------------------------
 # Channels
 # ---------------------------------------------------------------------
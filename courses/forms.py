@@ -1,6 +1,6 @@
 from django import forms
 from django.utils.text import slugify
-from .models import Course, Lecture, Feedback, Enrollment, Module
+from .models import Course, Lecture, Feedback, Enrollment, Module, CourseEvent
 from django.forms import inlineformset_factory
 
 
@@ -24,6 +24,12 @@ class LectureForm(forms.ModelForm):
 ModuleFormSet = inlineformset_factory(Course, Module, form=ModuleForm, extra=1, can_delete=True)
 LectureFormSet = inlineformset_factory(Module, Lecture, form=LectureForm, extra=1, can_delete=True)
 
+class CourseEventForm(forms.ModelForm):
+    class Meta:
+        model = CourseEvent
+        fields = ['title', 'description', 'start_time', 'end_time']
+
+
 class FeedbackForm(forms.ModelForm):
     class Meta:
         model = Feedback
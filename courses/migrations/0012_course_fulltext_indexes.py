@@ -0,0 +1,19 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0011_lectureprogress_delete_progress'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="CREATE FULLTEXT INDEX course_title_ft ON courses_course (title)",
+            reverse_sql="DROP INDEX course_title_ft ON courses_course",
+        ),
+        migrations.RunSQL(
+            sql="CREATE FULLTEXT INDEX course_description_ft ON courses_course (description)",
+            reverse_sql="DROP INDEX course_description_ft ON courses_course",
+        ),
+    ]
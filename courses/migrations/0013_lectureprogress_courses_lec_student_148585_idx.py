@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-08-30 00:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0012_course_fulltext_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lectureprogress',
+            index=models.Index(fields=['student', 'lecture', 'completed'], name='courses_lec_student_148585_idx'),
+        ),
+    ]
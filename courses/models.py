@@ -11,6 +11,8 @@ class Course(models.Model):
     description = models.TextField()
     price = models.DecimalField(max_digits=8, decimal_places=2, default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    # indexed so the Last-Modified check in course_list stays a cheap MAX()
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     
     # students enrolled
@@ -93,11 +95,31 @@ class LectureProgress(models.Model):
 
     class Meta:
         unique_together = ('student', 'lecture')  # one record per student per lecture
+        indexes = [
+            # covers the (student, lecture, completed) progress counts
+            models.Index(fields=['student', 'lecture', 'completed']),
+        ]
 
     def __str__(self):
         return f"{self.student.username} - {self.lecture.title} ({'Done' if self.completed else 'Pending'})"
 
 
+class Search(models.Lookup):
+    """Full-text `__search` lookup backed by the MySQL FULLTEXT indexes
+    on Course.title / Course.description (see migration 0012)."""
+    lookup_name = "search"
+
+    def as_mysql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        params = lhs_params + rhs_params
+        return "MATCH (%s) AGAINST (%s)" % (lhs, rhs), params
+
+
+models.CharField.register_lookup(Search)
+models.TextField.register_lookup(Search)
+
+
 class CourseEvent(models.Model):
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="events")
     title = models.CharField(max_length=200)
@@ -0,0 +1,26 @@
+"""Shared query helpers for the student progress views."""
+
+from django.db.models import Exists, OuterRef
+from django.shortcuts import get_object_or_404
+
+from .models import Enrollment, Lecture, LectureProgress
+
+
+def student_enrollment_or_404(user, course_id):
+    """Return the student's enrollment with course and instructor joined, or 404."""
+    return get_object_or_404(
+        Enrollment.objects.select_related('course', 'course__instructor'),
+        course_id=course_id, student=user,
+    )
+
+
+def lectures_with_completion(user):
+    """Lecture queryset annotated with a `done` flag for this student.
+
+    Both student_course_detail and student_progress build on this same
+    annotated queryset, so the database sees one parameterized statement
+    shape across both URLs.
+    """
+    return Lecture.objects.annotate(done=Exists(
+        LectureProgress.objects.filter(student=user, lecture=OuterRef('pk'), completed=True)
+    ))
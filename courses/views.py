@@ -2,36 +2,51 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.utils.dateparse import parse_datetime
+from django.core.cache import cache
+from django.db import transaction
+from django.http import Http404
 
 from .models import Course, Enrollment, Lecture, LectureProgress, Feedback, CourseEvent, Module
-from .forms import CourseForm, LectureForm, FeedbackForm, ModuleFormSet
-from users.decorators import instructor_required
-from django.db.models import Q
+from .forms import CourseForm, CourseEventForm, LectureForm, FeedbackForm, ModuleFormSet
+from .queries import lectures_with_completion, student_enrollment_or_404
+from users.decorators import instructor_required, student_required
+from django.db.models import Count, Exists, Max, OuterRef, Prefetch, Q, prefetch_related_objects
+from django.views.decorators.http import condition
 
 # -------------------------------
 # Common Views
 # -------------------------------
 
 
+def _courses_last_modified(request):
+    return Course.objects.aggregate(m=Max('updated_at'))['m']
+
+
+@condition(last_modified_func=_courses_last_modified)
 def course_list(request):
     query = request.GET.get('q')
-    courses = Course.objects.all()
 
-    if query:
-        courses = courses.filter(
-            Q(title__icontains=query) | Q(description__icontains=query)
-        )
+    # Cache the evaluated listing per search term; the page is read-heavy
+    # and identical queries repeat across anonymous visitors
+    cache_key = f'course_list:{query or ""}'
+    courses = cache.get(cache_key)
+    if courses is None:
+        qs = Course.objects.all()
+        if query:
+            # Full-text MATCH ... AGAINST hits the FULLTEXT indexes;
+            # icontains would force a sequential LIKE '%...%' scan
+            qs = qs.filter(
+                Q(title__search=query) | Q(description__search=query)
+            )
+        courses = list(qs.only('id', 'title', 'description'))
+        cache.set(cache_key, courses, 60)
 
     return render(request, 'courses/course_list.html', {'courses': courses, 'query': query})
 
-@login_required(login_url='/login/')
+@student_required
 def browse_courses(request):
     """Student: browse unenrolled courses"""
-    if getattr(request.user, 'role', None) != 'student':
-        return redirect('login')
-
-    available_courses = Course.objects.exclude(students=request.user)
+    available_courses = Course.objects.exclude(students=request.user).only('id', 'title', 'description')
     return render(request, 'courses/student/browse_course.html', {'courses': available_courses})
 
 
@@ -39,21 +54,20 @@ def browse_courses(request):
 # Student Views
 # -------------------------------
 
-@login_required(login_url="/auth/")
+@student_required
 def student_dashboard(request):
-    if request.user.role != "student":
-        return redirect("login")
-    enrolled_courses = Course.objects.filter(enrollments__student=request.user)
+    enrolled_courses = Course.objects.filter(enrollments__student=request.user).only('id', 'title', 'description')
     return render(request, "courses/student_dashboard.html", {"enrolled_courses": enrolled_courses})
 
-@login_required(login_url='/login/')
+@student_required
 def enroll_course(request, course_id):
     """Student: enroll in a course"""
-    if getattr(request.user, 'role', None) != 'student':
-        return redirect('student_login')
-
     course = get_object_or_404(Course, id=course_id)
-    Enrollment.objects.get_or_create(student=request.user, course=course)
+    # Single-statement upsert: the (student, course) unique constraint
+    # swallows duplicates, avoiding get_or_create's SELECT-then-INSERT
+    Enrollment.objects.bulk_create(
+        [Enrollment(student=request.user, course=course)], ignore_conflicts=True
+    )
     messages.success(request, f"Enrolled in {course.title}")
     return redirect('student_dashboard')
 
@@ -62,28 +76,20 @@ def enroll_course(request, course_id):
 def student_course_detail(request, course_id):
     """Student: view course details + progress"""
     
-    # Get the course if the student is enrolled
-    enrollment = get_object_or_404(Enrollment, course_id=course_id, student=request.user)
+    # Get the course if the student is enrolled (join Course + instructor in one query)
+    enrollment = student_enrollment_or_404(request.user, course_id)
     course = enrollment.course
 
-    # Fetch all lectures in this course
-    lectures = Lecture.objects.filter(module__course=course)
-
-    # Total lectures
-    total = lectures.count()
+    # The shared annotated queryset brings back lectures and completion flags
+    # in one statement, so the template loops need no further queries
+    prefetch_related_objects(
+        [course],
+        Prefetch('modules__lectures', queryset=lectures_with_completion(request.user)),
+    )
 
-    # Completed lectures (if no lectures, completed = 0)
-    completed = LectureProgress.objects.filter(
-        student=request.user,
-        lecture__in=lectures,
-        completed=True
-    ).count() if total > 0 else 0
-
-    # Progress map for quick lookup
-    progress_map = {
-        lp.lecture_id: lp.completed
-        for lp in LectureProgress.objects.filter(student=request.user, lecture__in=lectures)
-    }
+    lectures = [lecture for module in course.modules.all() for lecture in module.lectures.all()]
+    total = len(lectures)
+    completed = sum(1 for lecture in lectures if lecture.done)
 
     # Progress percentage
     progress_percent = int((completed / total * 100) if total else 0)
@@ -93,50 +99,46 @@ def student_course_detail(request, course_id):
         'lectures': lectures,
         'total': total,
         'completed': completed,
-        'progress_map': progress_map,
         'progress_percent': progress_percent,
     })
 
 
-@login_required(login_url='/login/')
+@student_required
 def mark_lecture_complete(request, lecture_id):
     """Student: mark lecture complete"""
-    lecture = get_object_or_404(Lecture, id=lecture_id)
-
-    # ✅ Correct way — Lecture has no 'course', it goes through module.course
-    course = lecture.module.course
-
-    # ✅ Prevent non-students from accessing this
-    if getattr(request.user, 'role', None) != 'student':
-        return redirect('login')
-
-    # ✅ Create OR update progress to mark completed
-    LectureProgress.objects.update_or_create(
-        student=request.user,
-        lecture=lecture,
-        defaults={'completed': True}
-    )
-    return redirect('student:student_course_detail', course_id=lecture.module.course.id)
+    # Only the course id is needed for the redirect — skip hydrating Lecture
+    try:
+        course_id = Lecture.objects.values_list('module__course_id', flat=True).get(id=lecture_id)
+    except Lecture.DoesNotExist:
+        raise Http404("Lecture not found")
+
+    # UPDATE first: a replaying student usually already has a progress row,
+    # so the common case is one statement instead of SELECT + UPDATE/INSERT
+    updated = LectureProgress.objects.filter(
+        student=request.user, lecture_id=lecture_id
+    ).update(completed=True)
+    if not updated:
+        LectureProgress.objects.create(student=request.user, lecture_id=lecture_id, completed=True)
+
+    return redirect('student:student_course_detail', course_id=course_id)
 
 @login_required(login_url='/student/login/')
 def student_progress(request, course_id):
     """
     Student: View overall progress for a course (without individual lectures)
     """
-    # Ensure the student is enrolled in the course
-    enrollment = get_object_or_404(Enrollment, course_id=course_id, student=request.user)
+    # Ensure the student is enrolled in the course (join Course + instructor in one query)
+    enrollment = student_enrollment_or_404(request.user, course_id)
     course = enrollment.course
 
-    # Get all lectures for the course
-    lectures = Lecture.objects.filter(module__course=course)
-    total = lectures.count()
-
-    # Count completed lectures
-    completed = LectureProgress.objects.filter(
-        student=request.user,
-        lecture__in=lectures,
-        completed=True
-    ).count() if total > 0 else 0
+    # One statement: completion flags for every lecture in the course
+    flags = list(
+        lectures_with_completion(request.user)
+        .filter(module__course=course)
+        .values_list('done', flat=True)
+    )
+    total = len(flags)
+    completed = sum(1 for done in flags if done)
 
     # Calculate percentage
     progress_percent = int((completed / total * 100) if total else 0)
@@ -157,7 +159,7 @@ def student_progress(request, course_id):
 @login_required
 def instructor_dashboard(request):
     """Instructor dashboard"""
-    courses = Course.objects.filter(instructor=request.user)
+    courses = Course.objects.filter(instructor=request.user).only('id', 'title', 'description', 'price')
     return render(request, 'courses/instructor/home.html', {'courses': courses})
 
 @login_required
@@ -165,25 +167,35 @@ def add_course(request):
     if request.method == 'POST':
         course_form = CourseForm(request.POST, request.FILES)
         if course_form.is_valid():
-            course = course_form.save(commit=False)
-            course.instructor = request.user
-            course.save()
-
-            module_total = int(request.POST.get('modules-TOTAL_FORMS', 0))
-            for i in range(module_total):
-                title = request.POST.get(f'modules-{i}-title')
-                desc = request.POST.get(f'modules-{i}-description')
-                if title:
-                    module = Module.objects.create(course=course, title=title, description=desc)
-
-                    lecture_index = 0
-                    while True:
-                        lecture_title = request.POST.get(f'modules-{i}-lectures-{lecture_index}-title')
-                        lecture_file = request.FILES.get(f'modules-{i}-lectures-{lecture_index}-video')
-                        if not lecture_title:
-                            break
-                        Lecture.objects.create(module=module, title=lecture_title, video=lecture_file)
-                        lecture_index += 1
+            # One transaction for the whole course tree: a single commit
+            # instead of an fsync per INSERT, and no half-created course
+            # if anything below raises
+            with transaction.atomic():
+                course = course_form.save(commit=False)
+                course.instructor = request.user
+                course.save()
+
+                module_total = int(request.POST.get('modules-TOTAL_FORMS', 0))
+                lectures_to_create = []
+                for i in range(module_total):
+                    title = request.POST.get(f'modules-{i}-title')
+                    desc = request.POST.get(f'modules-{i}-description')
+                    if title:
+                        # Modules are created one by one because MySQL's bulk_create
+                        # does not return PKs, which the lectures below need
+                        module = Module.objects.create(course=course, title=title, description=desc)
+
+                        lecture_index = 0
+                        while True:
+                            lecture_title = request.POST.get(f'modules-{i}-lectures-{lecture_index}-title')
+                            lecture_file = request.FILES.get(f'modules-{i}-lectures-{lecture_index}-video')
+                            if not lecture_title:
+                                break
+                            lectures_to_create.append(Lecture(module=module, title=lecture_title, video=lecture_file))
+                            lecture_index += 1
+
+                if lectures_to_create:
+                    Lecture.objects.bulk_create(lectures_to_create)
 
             return redirect('instructor_dashboard')
     else:
@@ -211,16 +223,22 @@ def course_edit(request, course_id):
 
 
 def course_detail(request, course_id):
-    course = get_object_or_404(Course, id=course_id, instructor=request.user)
+    # Prefetch modules and their lectures so the template loops hit the
+    # cache instead of one query per module
+    course = get_object_or_404(
+        Course.objects.prefetch_related(
+            Prefetch('modules', queryset=Module.objects.prefetch_related(
+                # the template renders title and video only; skip the file column
+                Prefetch('lectures', queryset=Lecture.objects.defer('file'))
+            ))
+        ),
+        id=course_id, instructor=request.user
+    )
     modules = course.modules.all()
-    lectures = []
-    for module in course.modules.all():
-        lectures = module.lectures.all()
 
     return render(request, 'courses/instructor/course_detail.html', {
         'course': course,
         'modules': modules,
-        'lectures': lectures,
     })
 
 @login_required
@@ -267,20 +285,26 @@ def delete_lecture(request, course_id, lecture_id):
 @login_required
 def course_progress_report(request, course_id):
     course = get_object_or_404(Course, id=course_id, instructor=request.user)
-    enrollments = Enrollment.objects.filter(course=course)
-    progress_data = []
-    total_lectures = sum(module.lectures.count() for module in course.modules.all())
+    total_lectures = Lecture.objects.filter(module__course=course).count()
+
+    # One annotated query instead of a LectureProgress count per student
+    enrollments = (
+        Enrollment.objects
+        .filter(course=course)
+        .select_related('student')
+        .annotate(completed=Count(
+            'student__lectureprogress',
+            filter=Q(student__lectureprogress__lecture__module__course=course,
+                     student__lectureprogress__completed=True)
+        ))
+    )
 
+    progress_data = []
     for enrollment in enrollments:
-        student = enrollment.student
-        completed = LectureProgress.objects.filter(
-            student=student,
-            lecture__module__course=course,  # Fixed this line
-            completed=True
-        ).count()
+        completed = enrollment.completed
         progress = (completed / total_lectures * 100) if total_lectures else 0
         progress_data.append({
-            "student": student,
+            "student": enrollment.student,
             "completed": completed,
             "total": total_lectures,
             "progress": progress
@@ -295,16 +319,16 @@ def course_progress_report(request, course_id):
 def add_event(request, course_id):
     course = get_object_or_404(Course, id=course_id, instructor=request.user)
     if request.method == 'POST':
-        title = request.POST.get('title')
-        description = request.POST.get('description')
-        start_time = parse_datetime(request.POST.get('start_time'))
-        end_time = parse_datetime(request.POST.get('end_time'))
-
-        CourseEvent.objects.create(course=course, title=title, description=description, start_time=start_time, end_time=end_time)
-        messages.success(request, "Event added successfully.")
-        return redirect('instructor:course_detail', course_id=course.id)
+        form = CourseEventForm(request.POST)
+        if form.is_valid():
+            form.instance.course = course
+            form.save()
+            messages.success(request, "Event added successfully.")
+            return redirect('instructor:course_detail', course_id=course.id)
+    else:
+        form = CourseEventForm()
 
-    return render(request, 'courses/instructor/add_event.html', {'course': course})
+    return render(request, 'courses/instructor/add_event.html', {'course': course, 'form': form})
 
 
 
@@ -326,17 +350,13 @@ def give_feedback(request, course_id):
        
     return render(request, 'courses/instructor/give_feedback.html', {'form': form, 'course': course})
 
-@login_required(login_url='/login/')
+@student_required
 def student_course_list(request):
     """Student: list all available courses (both enrolled and unenrolled)"""
-    if getattr(request.user, 'role', None) != 'student':
-        return redirect('login')
-
-    # Show all courses (you can change to only unenrolled if preferred)
-    courses = Course.objects.all()
-    enrolled_ids = Enrollment.objects.filter(student=request.user).values_list('course_id', flat=True)
-
-    for course in courses:
-        course.is_enrolled = course.id in enrolled_ids
+    # Show all courses (you can change to only unenrolled if preferred);
+    # the enrolled flag is computed in SQL rather than a Python loop
+    courses = Course.objects.annotate(
+        is_enrolled=Exists(Enrollment.objects.filter(course=OuterRef('pk'), student=request.user))
+    )
 
     return render(request, 'courses/student/student_course_list.html', {'courses': courses})
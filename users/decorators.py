@@ -14,3 +14,17 @@ def instructor_required(view_func):
             return redirect('student_dashboard')  # keep students away
         return view_func(request, *args, **kwargs)
     return _wrapped
+
+
+def student_required(view_func):
+    @wraps(view_func)
+    def _wrapped(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return redirect('student_login')
+        # role lives on the User row itself, so this check is free —
+        # no extra profile SELECT per request
+        if getattr(request.user, 'role', None) != 'student':
+            messages.error(request, "You must be a student to access this page.")
+            return redirect('login')
+        return view_func(request, *args, **kwargs)
+    return _wrapped